@@ -1,18 +1,24 @@
 """Telegram bot package for interacting with a DigitalOcean AI Agent."""
 
 # Compatibility shim for python-telegram-bot Updater __slots__ issue.
-# Create a small runtime subclass that adds the missing private slot so the
-# library can assign the attribute without requiring edits to site-packages.
+# Slots cannot be added to an existing class, so when the private slot is
+# missing a minimal subclass declares just that one. The name is written in
+# its mangled form: a bare "__polling_cleanup_cb" here would be mangled with
+# the subclass name and never match the attribute Updater assigns.
+# ApplicationBuilder and the telegram.ext namespace bind Updater at import
+# time, so every module that holds a reference has to be rebound.
 try:
+    import telegram.ext as _ptb_ext
+    from telegram.ext import _applicationbuilder as _ptb_builder
     from telegram.ext import _updater as _ptb_updater
 
-    if "__polling_cleanup_cb" not in getattr(_ptb_updater.Updater, "__slots__", ()):  # type: ignore[attr-defined]
-        base_slots = tuple(getattr(_ptb_updater.Updater, "__slots__", ()))
+    if not hasattr(_ptb_updater.Updater, "_Updater__polling_cleanup_cb"):
 
         class _PatchedUpdater(_ptb_updater.Updater):  # type: ignore[misc]
-            __slots__ = base_slots + ("__polling_cleanup_cb",)
+            __slots__ = ("_Updater__polling_cleanup_cb",)
 
-        _ptb_updater.Updater = _PatchedUpdater  # type: ignore[attr-defined]
+        for _module in (_ptb_updater, _ptb_builder, _ptb_ext):
+            _module.Updater = _PatchedUpdater  # type: ignore[attr-defined]
 except Exception:
     # Don't fail import if PTB isn't available yet; error will surface later.
     pass
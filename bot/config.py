@@ -43,10 +43,13 @@ class BotConfig:
     api_max_retries: int = 3
     api_base_backoff: float = 0.5
     api_max_backoff: float = 60.0
+    api_max_inflight_retries: int = 5
     # Token-bucket rate limiter for outgoing requests to DigitalOcean
     api_rate_limit_qps: float = 5.0
     api_rate_limit_burst: int = 10
     api_rate_limit_cooldown: float = 5.0
+    # Maximum time (seconds) a request may wait for a rate-limit token; None = no limit
+    api_rate_limit_wait_timeout: Optional[float] = None
 
     @classmethod
     def load(cls, env_path: Optional[str] = None) -> "BotConfig":
@@ -105,6 +108,12 @@ class BotConfig:
         except ValueError as exc:
             raise RuntimeError("DO_API_TIMEOUT must be numeric") from exc
 
+        rate_wait_timeout_str = os.getenv("DO_API_RATE_WAIT_TIMEOUT")
+        try:
+            rate_wait_timeout = float(rate_wait_timeout_str) if rate_wait_timeout_str else None
+        except ValueError as exc:
+            raise RuntimeError("DO_API_RATE_WAIT_TIMEOUT must be numeric") from exc
+
         return cls(
             telegram_bot_token=token,
             do_api_key=api_key,
@@ -116,7 +125,9 @@ class BotConfig:
             api_max_retries=int(os.getenv("DO_API_MAX_RETRIES", "3")),
             api_base_backoff=float(os.getenv("DO_API_BASE_BACKOFF", "0.5")),
             api_max_backoff=float(os.getenv("DO_API_MAX_BACKOFF", "60")),
+            api_max_inflight_retries=int(os.getenv("DO_API_MAX_INFLIGHT_RETRIES", "5")),
             api_rate_limit_qps=float(os.getenv("DO_API_RATE_QPS", "5")),
             api_rate_limit_burst=int(os.getenv("DO_API_RATE_BURST", "10")),
             api_rate_limit_cooldown=float(os.getenv("DO_API_RATE_COOLDOWN", "5")),
+            api_rate_limit_wait_timeout=rate_wait_timeout,
         )
@@ -3,24 +3,89 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
-from dataclasses import dataclass
+import random
+import time
+from collections import deque
 from datetime import datetime, timezone
-from email.utils import parsedate_to_datetime
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Deque, Dict, Mapping, NamedTuple, Optional
 
 import httpx
+import orjson
 import uuid
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_POOL_LIMITS = httpx.Limits(
+    max_connections=1000,
+    max_keepalive_connections=100,
+    keepalive_expiry=30.0,
+)
+
+# Bound once so the rate-limit and backoff loops avoid global+attribute lookups.
+_sleep = asyncio.sleep
+_mono = time.monotonic
+
+# Synthetic endpoint-mode session ids only need to be unique per process: one
+# random prefix at import plus a counter avoids an urandom read per session.
+_SESSION_PREFIX = uuid.uuid4().hex[:16]
+_session_counter = itertools.count()
+
+# Upper bound on remembered per-session message URLs (one per active chat).
+_MAX_CACHED_SESSION_URLS = 4096
+
+# Adaptive rate limiting: outcome window size, samples needed before acting,
+# and the lowest rate the limiter will back off to (or a quarter of the
+# configured rate, whichever is lower).
+_ADAPTIVE_WINDOW = 32
+_ADAPTIVE_MIN_SAMPLES = 10
+_ADAPTIVE_MIN_QPS = 0.5
+
+# Key spellings used for the retry hint in 429 bodies.
+_RETRY_AFTER_KEYS = ("retry_after", "retryAfter")
+
+
+def _message_content(node: Any) -> Optional[str]:
+    """Return ``node["message"]["content"]`` if it is a string, else ``None``."""
+
+    if isinstance(node, dict):
+        message = node.get("message")
+        if isinstance(message, dict):
+            content = message.get("content")
+            if isinstance(content, str):
+                return content
+    return None
+
+
+def create_http_client(
+    timeout: float = 30.0,
+    *,
+    http2: bool = True,
+    limits: Optional[httpx.Limits] = None,
+) -> httpx.AsyncClient:
+    """Create the pooled HTTP client used to talk to the DigitalOcean API.
+
+    Connections are kept warm and concurrent chats are multiplexed over HTTP/2
+    instead of paying a TLS handshake per request.
+    """
+
+    return httpx.AsyncClient(
+        # Fail fast on unreachable hosts so the retry loop can kick in, while
+        # still allowing slow agent replies the full timeout.
+        timeout=httpx.Timeout(timeout, connect=min(timeout, DEFAULT_CONNECT_TIMEOUT)),
+        http2=http2,
+        limits=limits or DEFAULT_POOL_LIMITS,
+    )
+
 
 class DigitalOceanAgentError(RuntimeError):
     """Raised when the DigitalOcean AI Agent API returns an error."""
 
 
-@dataclass(slots=True)
-class AgentResponse:
+class AgentResponse(NamedTuple):
     """Container for a response from the DigitalOcean AI Agent."""
 
     message: str
@@ -45,10 +110,15 @@ class DigitalOceanAgentClient:
         max_retries: int = 3,
         base_backoff: float = 0.5,
         max_backoff: float = 60.0,
+        max_inflight_retries: int = 5,
         # Token-bucket rate limiter (requests per second and burst)
         rate_qps: float = 5.0,
         rate_burst: int = 10,
         rate_cooldown: float = 5.0,
+        rate_wait_timeout: Optional[float] = None,
+        # Connection pool tuning for the default HTTP client
+        http2: bool = True,
+        limits: Optional[httpx.Limits] = None,
     ) -> None:
         self._api_key = api_key
         self._agent_id = agent_id
@@ -56,22 +126,56 @@ class DigitalOceanAgentClient:
         self._agent_endpoint = agent_endpoint.rstrip("/") if agent_endpoint else None
         self._agent_access_key = agent_access_key
         self._use_endpoint = bool(self._agent_endpoint and self._agent_access_key)
-        self._client = client or httpx.AsyncClient(timeout=timeout)
-        self._owns_client = client is None
-        self._lock = asyncio.Lock()
+        # Fixed request URLs, formatted once rather than on every call.
+        self._sessions_url = f"{self._base_url}/agents/{self._agent_id}/sessions"
+        self._session_urls: Dict[str, str] = {}
+        self._endpoint_url = (
+            f"{self._agent_endpoint}/api/v1/chat/completions" if self._agent_endpoint else None
+        )
+        # Request headers never change after construction; build them once.
+        self._headers: Mapping[str, str] = MappingProxyType(
+            {
+                "Authorization": f"Bearer {self._api_key}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            }
+        )
+        self._endpoint_headers: Mapping[str, str] = MappingProxyType(
+            {
+                "Authorization": f"Bearer {self._agent_access_key}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            }
+        )
+        if client is None:
+            client = create_http_client(timeout, http2=http2, limits=limits)
+            self._owns_client = True
+        else:
+            self._owns_client = False
+        self._client = client
         # Retry/backoff policy
         self._max_retries = int(max_retries)
+        self._retry_range = range(0, max(1, self._max_retries) + 1)
+        # Caps how many requests may be in their retry phase at the same time
+        self._retry_slots = asyncio.Semaphore(max(1, int(max_inflight_retries)))
         self._base_backoff = float(base_backoff)
         self._max_backoff = float(max_backoff)
+        # Per-client jitter source, independent of the module-level random state
+        self._rng = random.Random()
         # Token-bucket state
         self._rate_qps = float(rate_qps)
+        # Adaptive rate: shrink on frequent 429s, grow back towards the configured rate
+        self._base_rate_qps = self._rate_qps
+        self._outcomes: Deque[bool] = deque(maxlen=_ADAPTIVE_WINDOW)
+        self._rate_adjusted_at = time.monotonic()
         self._rate_burst = int(rate_burst)
         self._tokens = float(self._rate_burst)
-        # Use event loop time for monotonic timestamp
-        self._last_refill = asyncio.get_event_loop().time()
-        self._rate_lock = asyncio.Lock()
+        self._last_refill = time.monotonic()
+        self._rate_waiters = asyncio.Lock()
         self._cooldown_until = 0.0
         self._default_retry_after = float(max(rate_cooldown, 0.0))
+        # Upper bound on how long a single request may wait for a token
+        self._rate_wait_timeout = rate_wait_timeout
 
     async def close(self) -> None:
         """Close the underlying HTTP client if owned by the instance."""
@@ -90,15 +194,14 @@ class DigitalOceanAgentClient:
         if self._use_endpoint:
             # Endpoint mode does not require creating a session; return a
             # synthetic session id so handlers can store something.
-            sid = f"endpoint-{uuid.uuid4().hex}"
+            sid = f"endpoint-{_SESSION_PREFIX}-{next(_session_counter)}"
             logger.debug("Using agent endpoint mode, generated session id %s", sid)
             return sid
 
-        url = f"{self._base_url}/agents/{self._agent_id}/sessions"
+        url = self._sessions_url
         logger.debug("Creating new DigitalOcean AI Agent session at %s", url)
         # perform request with retry behaviour
-        async with self._lock:
-            response = await self._request_with_retries("POST", url, headers=self._headers)
+        response = await self._request_with_retries("POST", url, headers=self._headers)
         data = self._handle_response(response)
         session_id = (
             data.get("session", {}).get("id")
@@ -109,7 +212,19 @@ class DigitalOceanAgentClient:
             raise DigitalOceanAgentError(
                 "DigitalOcean API response did not include a session identifier"
             )
-        return str(session_id)
+        session_id = str(session_id)
+        self._cache_session_url(session_id)
+        return session_id
+
+    def _cache_session_url(self, session_id: str) -> str:
+        """Build and remember the messages URL for ``session_id``."""
+
+        urls = self._session_urls
+        if len(urls) >= _MAX_CACHED_SESSION_URLS:
+            # Evict the oldest entry (dicts keep insertion order)
+            del urls[next(iter(urls))]
+        url = urls[session_id] = f"{self._base_url}/sessions/{session_id}/messages"
+        return url
 
     async def send_message(
         self,
@@ -127,7 +242,7 @@ class DigitalOceanAgentClient:
           user message (the server-side session stores context).
         """
         if self._use_endpoint:
-            url = f"{self._agent_endpoint}/api/v1/chat/completions"
+            url = self._endpoint_url
             # Prepare messages array: prefer explicit `messages`, else wrap single message
             if messages is None:
                 if message is None:
@@ -144,10 +259,9 @@ class DigitalOceanAgentClient:
                 "include_guardrails_info": False,
             }
             logger.debug("Sending messages to agent endpoint %s: %s", url, payload_messages)
-            async with self._lock:
-                response = await self._request_with_retries(
-                    "POST", url, headers=self._endpoint_headers, json=payload
-                )
+            response = await self._request_with_retries(
+                "POST", url, headers=self._endpoint_headers, content=orjson.dumps(payload)
+            )
             data = self._handle_response(response)
             # Try several extraction heuristics (OpenAI-like or agent response)
             reply = self._extract_endpoint_reply_text(data)
@@ -157,15 +271,16 @@ class DigitalOceanAgentClient:
         if message is None:
             raise ValueError("message must be provided for management API mode")
 
-        url = f"{self._base_url}/sessions/{session_id}/messages"
+        url = self._session_urls.get(session_id)
+        if url is None:
+            url = self._cache_session_url(session_id)
         payload = {"role": "user", "content": message}
         logger.debug(
             "Sending message to session %s via %s: %s", session_id, url, message
         )
-        async with self._lock:
-            response = await self._request_with_retries(
-                "POST", url, headers=self._headers, json=payload
-            )
+        response = await self._request_with_retries(
+            "POST", url, headers=self._headers, content=orjson.dumps(payload)
+        )
         data = self._handle_response(response)
         reply = self._extract_reply_text(data)
         return AgentResponse(message=reply, raw=data)
@@ -173,39 +288,53 @@ class DigitalOceanAgentClient:
     def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
         """Validate the HTTP response and return the decoded JSON body."""
 
-        try:
-            response.raise_for_status()
-        except httpx.HTTPStatusError as exc:  # pragma: no cover - network errors
-            detail = self._safe_json(response)
-            logger.error(
-                "DigitalOcean API returned status %s: %s",
-                response.status_code,
-                detail,
-            )
-            raise DigitalOceanAgentError(
-                f"DigitalOcean API returned {response.status_code}: {detail}"
-            ) from exc
-        return self._safe_json(response)
+        status_code = response.status_code
+        if 200 <= status_code < 300:
+            return self._safe_json(response)
+
+        detail = self._safe_json(response)  # pragma: no cover - network errors
+        logger.error(
+            "DigitalOcean API returned status %s: %s",
+            status_code,
+            detail,
+        )
+        raise DigitalOceanAgentError(
+            f"DigitalOcean API returned {status_code}: {detail}"
+        )
 
     def _safe_json(self, response: httpx.Response) -> Dict[str, Any]:
+        # A 429 body is already decoded by the retry loop; when that response is
+        # handed back to the caller, reuse the parsed body instead of decoding twice.
+        cached = getattr(response, "_cached_json", None)
+        if cached is not None:
+            return cached
         try:
-            return response.json()
-        except ValueError:  # pragma: no cover - depends on API behaviour
-            return {"raw_text": response.text}
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            # orjson is strict (UTF-8 only, no NaN/Infinity); let httpx retry with
+            # charset detection and the stdlib parser before giving up.
+            try:
+                data = response.json()
+            except ValueError:  # pragma: no cover - depends on API behaviour
+                data = {"raw_text": response.text}
+        response._cached_json = data  # type: ignore[attr-defined]
+        return data
 
     async def _sleep_backoff(self, attempt: int, retry_after: Optional[float] = None) -> None:
         """Compute backoff sleep (with jitter) for given attempt; respect Retry-After if provided."""
-        import random
 
         if retry_after is not None and retry_after > 0:
-            to_sleep = min(retry_after, self._max_backoff)
+            # Server hint is the floor; a little upward jitter keeps clients
+            # that got the same 429 from retrying in lockstep.
+            floor = min(retry_after, self._max_backoff)
+            to_sleep = floor + self._rng.random() * min(1.0, floor * 0.2)
         else:
-            to_sleep = min(self._base_backoff * (2 ** attempt), self._max_backoff)
-        # jitter
-        jitter = to_sleep * 0.1 * (random.random())
-        to_sleep = to_sleep + jitter
+            # Equal jitter: never less than half the exponential step, so
+            # throttled retries cannot collapse to an immediate retry.
+            cap = min(self._base_backoff * (2 ** attempt), self._max_backoff)
+            to_sleep = cap / 2 + self._rng.random() * (cap / 2)
         logger.info("Backing off for %.2fs before retrying (attempt %d)", to_sleep, attempt)
-        await asyncio.sleep(to_sleep)
+        await _sleep(to_sleep)
 
     async def _request_with_retries(self, method: str, url: str, **kwargs) -> httpx.Response:
         """Perform HTTP request with retries on 429/429-like responses.
@@ -213,107 +342,157 @@ class DigitalOceanAgentClient:
         Respects `Retry-After` header when present and uses exponential backoff with jitter.
         """
         last_exc: Optional[Exception] = None
-        for attempt in range(0, max(1, self._max_retries) + 1):
-            # Acquire token from token-bucket limiter before each attempt
-            await self._acquire_token()
-            try:
-                resp = await self._client.request(method, url, **kwargs)
-                # If not a 429, return immediately (other errors handled later)
-                if resp.status_code != 429:
-                    return resp
-
-                # Handle 429: try to read Retry-After header/body hints and register cooldown
-                retry_after = self._parse_retry_after_header(resp)
-                detail = self._safe_json(resp)
-                if retry_after is None:
-                    retry_after = self._extract_retry_after_from_body(detail)
-                await self._register_cooldown(retry_after)
-                logger.warning(
-                    "Received 429 from DigitalOcean agent endpoint (attempt %d/%d): %s",
-                    attempt + 1,
-                    self._max_retries,
-                    detail,
-                )
-                if attempt >= self._max_retries:
-                    return resp
+        max_retries = self._max_retries
+        retrying = False
+        try:
+            for attempt in self._retry_range:
+                # Acquire token from token-bucket limiter before each attempt
+                await self._acquire_token(self._rate_wait_timeout)
+                try:
+                    resp = await self._client.request(method, url, **kwargs)
+                except httpx.HTTPError as exc:
+                    last_exc = exc
+                    logger.exception("HTTP error during request to %s: %s", url, exc)
+                    # for retriable transport errors, backoff and retry
+                    if attempt >= max_retries:
+                        raise
+                    retry_after = None
+                else:
+                    # If not a 429, return immediately (other errors handled later)
+                    if resp.status_code != 429:
+                        self._record_outcome(throttled=False)
+                        return resp
+                    self._record_outcome(throttled=True)
+
+                    # Handle 429: try to read Retry-After header/body hints and register cooldown
+                    retry_after = self._parse_retry_after_header(resp)
+                    detail = self._safe_json(resp)
+                    if retry_after is None:
+                        retry_after = self._extract_retry_after_from_body(detail)
+                    await self._register_cooldown(retry_after)
+                    logger.warning(
+                        "Received 429 from DigitalOcean agent endpoint (attempt %d/%d): %s",
+                        attempt + 1,
+                        max_retries,
+                        detail,
+                    )
+                    if attempt >= max_retries:
+                        return resp
+
+                # Only retries compete for the shared retry slots, so first
+                # attempts are never held back and a widespread failure cannot
+                # turn every chat into a concurrent retry storm.
+                if not retrying:
+                    await self._retry_slots.acquire()
+                    retrying = True
                 await self._sleep_backoff(attempt + 1, retry_after=retry_after)
-                continue
-            except httpx.HTTPError as exc:
-                last_exc = exc
-                logger.exception("HTTP error during request to %s: %s", url, exc)
-                # for retriable transport errors, backoff and retry
-                if attempt >= self._max_retries:
-                    raise
-                await self._sleep_backoff(attempt + 1, retry_after=None)
-                continue
+        finally:
+            if retrying:
+                self._retry_slots.release()
 
         if last_exc:
             raise last_exc
         raise RuntimeError("Failed to complete request with retries")
 
-    async def _acquire_token(self) -> None:
-        """Acquire a token from the token-bucket. Wait until a token is available."""
+    def _record_outcome(self, *, throttled: bool) -> None:
+        """Track recent 429s and adapt the token-bucket rate to them.
 
-        loop = asyncio.get_event_loop()
-        while True:
-            async with self._rate_lock:
-                now = loop.time()
+        When more than a fifth of recent responses were throttled the rate is cut
+        by 20%, never below ``_ADAPTIVE_MIN_QPS`` or a quarter of ``rate_qps``
+        (whichever is lower); after a minute with (almost) no throttling it is
+        raised by 25%, never above the configured ``rate_qps``.
+        """
 
-                if now < self._cooldown_until:
-                    wait_seconds = self._cooldown_until - now
-                else:
-                    elapsed = max(0.0, now - self._last_refill)
-                    if elapsed > 0:
-                        refill = elapsed * self._rate_qps
-                        if refill > 0:
-                            self._tokens = min(self._rate_burst, self._tokens + refill)
-                        self._last_refill = now
-
-                    if self._tokens >= 1.0:
-                        self._tokens -= 1.0
+        outcomes = self._outcomes
+        outcomes.append(throttled)
+        if len(outcomes) < _ADAPTIVE_MIN_SAMPLES:
+            return
+        ratio = sum(outcomes) / len(outcomes)
+        base = self._base_rate_qps
+        qps = self._rate_qps
+        now = _mono()
+        if ratio > 0.2:
+            new_qps = max(min(_ADAPTIVE_MIN_QPS, base * 0.25), qps * 0.8)
+        elif ratio < 0.05 and qps < base and now - self._rate_adjusted_at >= 60.0:
+            new_qps = min(base, qps * 1.25)
+        else:
+            return
+        if new_qps != qps:
+            logger.info("Adjusting DigitalOcean request rate from %.2f to %.2f qps", qps, new_qps)
+            self._rate_qps = new_qps
+        self._rate_adjusted_at = now
+        # Judge the new rate on fresh outcomes only
+        outcomes.clear()
+
+    async def _acquire_token(self, timeout: Optional[float] = None) -> None:
+        """Acquire a token from the token-bucket. Wait until a token is available.
+
+        If ``timeout`` is given and no token is obtained within that many seconds,
+        :class:`DigitalOceanAgentError` is raised instead of waiting forever.
+        """
+
+        # Fast path: nobody is queued ahead of us, so try the bucket directly.
+        # _take_token never awaits, which makes the check-and-debit atomic with
+        # respect to other coroutines; the waiter lock is never touched and the
+        # call completes without yielding to the event loop.
+        if not self._rate_waiters.locked() and self._take_token() is None:
+            return
+
+        # Slow path: waiters queue FIFO on _rate_waiters and only the head of the
+        # queue sleeps on the refill timer. Each token wakes exactly one caller
+        # instead of every sleeper retrying the bucket at once.
+        try:
+            async with asyncio.timeout(timeout), self._rate_waiters:
+                while True:
+                    # _take_token never awaits, so the bucket update itself needs
+                    # no lock of its own.
+                    wait_seconds = self._take_token()
+                    if wait_seconds is None:
                         return
+                    await _sleep(max(wait_seconds, 0.01))
+        except TimeoutError as exc:
+            raise DigitalOceanAgentError(
+                f"rate-limit wait exceeded {timeout:.1f}s"
+            ) from exc
 
-                    needed = 1.0 - self._tokens
-                    wait_seconds = (
-                        needed / self._rate_qps if self._rate_qps > 0 else 1.0
-                    )
+    def _take_token(self) -> Optional[float]:
+        """Refill the bucket and take a token.
 
-            await asyncio.sleep(max(wait_seconds, 0.01))
+        Returns ``None`` when a token was taken, otherwise the number of seconds
+        to wait before the next token becomes available.
+        """
 
-    @property
-    def _headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        now = _mono()
+        cooldown_until = self._cooldown_until
+        if now < cooldown_until:
+            return cooldown_until - now
 
-    @property
-    def _endpoint_headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self._agent_access_key}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        rate_qps = self._rate_qps
+        tokens = self._tokens
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            tokens = min(self._rate_burst, tokens + elapsed * rate_qps)
+            self._last_refill = now
+
+        if tokens >= 1.0:
+            self._tokens = tokens - 1.0
+            return None
+
+        self._tokens = tokens
+        return (1.0 - tokens) / rate_qps if rate_qps > 0 else 1.0
 
     def _extract_endpoint_reply_text(self, data: Dict[str, Any]) -> str:
-        # OpenAI-like response: data.choices[0].message.content
-        try:
-            choices = data.get("choices")
-            if isinstance(choices, list) and choices:
-                first = choices[0]
-                # message.content
-                msg = first.get("message")
-                if isinstance(msg, dict):
-                    content = msg.get("content")
-                    if isinstance(content, str):
-                        return content
-                # text fallback
+        # OpenAI-like response: data.choices[0].message.content, then .text
+        choices = data.get("choices") if isinstance(data, dict) else None
+        if isinstance(choices, list) and choices:
+            first = choices[0]
+            content = _message_content(first)
+            if content is not None:
+                return content
+            if isinstance(first, dict):
                 text = first.get("text")
                 if isinstance(text, str):
                     return text
-        except Exception:
-            pass
         # Fallback to previous extraction logic
         return self._extract_reply_text(data)
 
@@ -321,22 +500,20 @@ class DigitalOceanAgentClient:
     def _extract_reply_text(data: Dict[str, Any]) -> str:
         """Extract reply text from a DigitalOcean API payload."""
 
-        possible_paths = [
-            ("message", "content"),
-            ("response", "output"),
-            ("response", "output_text"),
-            ("data", "message", "content"),
-        ]
-        for path in possible_paths:
-            node: Any = data
-            for key in path:
-                if isinstance(node, dict) and key in node:
-                    node = node[key]
-                else:
-                    break
-            else:
-                if isinstance(node, str):
-                    return node
+        if isinstance(data, dict):
+            # message.content, response.output(_text), data.message.content
+            content = _message_content(data)
+            if content is not None:
+                return content
+            response = data.get("response")
+            if isinstance(response, dict):
+                for key in ("output", "output_text"):
+                    text = response.get(key)
+                    if isinstance(text, str):
+                        return text
+            content = _message_content(data.get("data"))
+            if content is not None:
+                return content
         logger.warning("Falling back to raw response for reply text: %s", data)
         return str(data)
 
@@ -344,10 +521,17 @@ class DigitalOceanAgentClient:
         header_value = response.headers.get("Retry-After")
         if not header_value:
             return None
+        # Common case: integer delay-seconds. float() rather than int() so huge
+        # values become inf (capped later by max_backoff) instead of raising.
+        if header_value.isdecimal():
+            return float(header_value)
         try:
             value = float(header_value)
             return max(0.0, value)
         except (TypeError, ValueError):
+            # HTTP-date form is rare; only pull in the email parser when needed.
+            from email.utils import parsedate_to_datetime
+
             try:
                 dt = parsedate_to_datetime(header_value)
             except (TypeError, ValueError, OverflowError):
@@ -361,27 +545,20 @@ class DigitalOceanAgentClient:
             return max(0.0, delta)
 
     def _extract_retry_after_from_body(self, data: Dict[str, Any]) -> Optional[float]:
-        candidates = [
-            ("retry_after",),
-            ("retryAfter",),
-            ("error", "retry_after"),
-            ("error", "retryAfter"),
-            ("meta", "retry_after"),
-        ]
-
-        for path in candidates:
-            node: Any = data
-            for key in path:
-                if isinstance(node, dict) and key in node:
-                    node = node[key]
-                else:
-                    break
-            else:
+        if not isinstance(data, dict):
+            return None
+        # Top-level hint first, then the nested ``error``/``meta`` objects.
+        for node in (data, data.get("error"), data.get("meta")):
+            if not isinstance(node, dict):
+                continue
+            for key in _RETRY_AFTER_KEYS:
+                value = node.get(key)
+                if value is None:
+                    continue
                 try:
-                    value = float(node)
+                    return max(0.0, float(value))
                 except (TypeError, ValueError):
-                    continue
-                return max(0.0, value)
+                    pass
         return None
 
     async def _register_cooldown(self, retry_after: Optional[float]) -> None:
@@ -396,12 +573,14 @@ class DigitalOceanAgentClient:
             wait = self._default_retry_after
         if wait <= 0:
             return
-        loop = asyncio.get_event_loop()
-        now = loop.time()
-        async with self._rate_lock:
-            target = now + wait
-            if target > self._cooldown_until:
-                self._cooldown_until = target
-            self._last_refill = now
-            # Drop available tokens so that the next request waits until cooldown expires
-            self._tokens = 0.0
+        # Same cap as the retry sleep, so an absurd hint cannot stall the bucket forever
+        wait = min(wait, self._max_backoff)
+        # No lock needed: nothing below awaits, so these updates are atomic with
+        # respect to other coroutines, and the cooldown only ever moves forward.
+        now = _mono()
+        target = now + wait
+        if target > self._cooldown_until:
+            self._cooldown_until = target
+        self._last_refill = now
+        # Drop available tokens so that the next request waits until cooldown expires
+        self._tokens = 0.0
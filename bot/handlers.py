@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Optional
 
+import httpx
 from telegram import Update
 from telegram.constants import ParseMode
 from telegram.ext import (
@@ -18,31 +21,49 @@ from telegram.ext import (
 )
 
 from .config import BotConfig
-from .do_agent import DigitalOceanAgentClient, DigitalOceanAgentError, AgentResponse
+from .do_agent import (
+    AgentResponse,
+    DigitalOceanAgentClient,
+    DigitalOceanAgentError,
+    create_http_client,
+)
 
 logger = logging.getLogger(__name__)
 
 _SESSION_ID_KEY = "do_agent_session_id"
 _HISTORY_KEY = "do_agent_history"
+_SESSION_TASK_KEY = "do_agent_session_task"
+_SESSION_GENERATION_KEY = "do_agent_session_generation"
+_PENDING_KEY = "do_agent_pending_messages"
+_WORKER_KEY = "do_agent_message_worker"
 MAX_HISTORY = 4
+# Messages sent in quick succession are coalesced into one agent request
+MAX_BATCH_MESSAGES = 4
+BATCH_WINDOW_SECONDS = 0.05
 
 
 def build_application(config: BotConfig) -> Application:
     """Create and configure a :class:`telegram.ext.Application`."""
 
+    # The connection pool is owned by the application rather than the agent
+    # client, so it survives if the agent client is ever rebuilt.
+    http_client = create_http_client(config.request_timeout)
     agent_client = DigitalOceanAgentClient(
         api_key=config.do_api_key,
         agent_id=config.do_agent_id,
         base_url=config.do_api_base_url,
         timeout=config.request_timeout,
+        client=http_client,
         agent_endpoint=config.agent_endpoint,
         agent_access_key=config.agent_access_key,
         max_retries=config.api_max_retries,
         base_backoff=config.api_base_backoff,
         max_backoff=config.api_max_backoff,
+        max_inflight_retries=config.api_max_inflight_retries,
         rate_qps=config.api_rate_limit_qps,
         rate_burst=config.api_rate_limit_burst,
         rate_cooldown=config.api_rate_limit_cooldown,
+        rate_wait_timeout=config.api_rate_limit_wait_timeout,
     )
 
     application = (
@@ -54,6 +75,7 @@ def build_application(config: BotConfig) -> Application:
         .build()
     )
 
+    application.bot_data["httpx_client"] = http_client
     application.bot_data["agent_client"] = agent_client
     # store config for handlers
     application.bot_data["bot_config"] = config
@@ -84,13 +106,18 @@ async def _on_shutdown(application: Application) -> None:
     agent_client: DigitalOceanAgentClient = application.bot_data.get("agent_client")
     if agent_client:
         await agent_client.close()
+    http_client = application.bot_data.get("httpx_client")
+    if http_client:
+        await http_client.aclose()
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle the /start command."""
 
     user_first_name = update.effective_user.first_name if update.effective_user else "there"
-    session_id = await _ensure_session(context)
+    # Create the agent session in the background so the greeting is not held
+    # up by an API round-trip; the first forwarded message awaits it.
+    _prewarm_session(context)
     await update.message.reply_text(
         (
             "Привет, {name}! Я бот консультант по продукции компании Биолинкс.\n"
@@ -98,7 +125,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         ).format(name=user_first_name),
         parse_mode=ParseMode.MARKDOWN,
     )
-    logger.info("Started new session %s for chat %s", session_id, update.effective_chat.id)
+    logger.info("Started conversation for chat %s", update.effective_chat.id)
 
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -111,6 +138,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 async def new_conversation(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Reset the conversation by creating a new session."""
 
+    _start_new_generation(context)
     await _create_and_store_session(context)
     await update.message.reply_text(
         "Создана новая сессия. Можете продолжить диалог с чистого листа!"
@@ -118,15 +146,60 @@ async def new_conversation(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
 
 async def forward_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Forward user messages to the DigitalOcean AI Agent."""
+    """Queue user messages for the DigitalOcean AI Agent.
+
+    Messages are answered by a worker task per user and chat, which coalesces a
+    quick burst of messages into a single agent request.
+    """
 
-    agent_client: DigitalOceanAgentClient = context.application.bot_data["agent_client"]
-    session_id = await _ensure_session(context)
     user_message = update.message.text.strip()
     if not user_message:
         await update.message.reply_text("Похоже, сообщение пустое. Попробуйте ещё раз.")
         return
 
+    # Sessions and history live in user_data, but queues are kept per chat so a
+    # batch only ever merges messages from one chat and is answered there.
+    chat_id = update.effective_chat.id
+    queues: dict[int, asyncio.Queue] = context.user_data.setdefault(_PENDING_KEY, {})
+    pending = queues.get(chat_id)
+    if pending is None:
+        pending = queues[chat_id] = asyncio.Queue()
+    pending.put_nowait(update)
+
+    workers: dict[int, asyncio.Task] = context.user_data.setdefault(_WORKER_KEY, {})
+    worker = workers.get(chat_id)
+    if worker is None or worker.done():
+        workers[chat_id] = context.application.create_task(
+            _drain_pending(pending, context), update=update
+        )
+
+
+async def _drain_pending(pending: asyncio.Queue, context: ContextTypes.DEFAULT_TYPE) -> None:
+    # Exits as soon as the queue is empty; there is no await between that check
+    # and returning, so forward_message either sees this task running or done.
+    while not pending.empty():
+        batch: list[Update] = [pending.get_nowait()]
+        while len(batch) < MAX_BATCH_MESSAGES:
+            try:
+                batch.append(await asyncio.wait_for(pending.get(), BATCH_WINDOW_SECONDS))
+            except asyncio.TimeoutError:
+                break
+        try:
+            await _answer_messages(batch, context)
+        except Exception:
+            # Keep draining: a failed batch must not strand messages queued behind it.
+            logger.exception("Failed to answer %d queued message(s)", len(batch))
+
+
+async def _answer_messages(batch: list[Update], context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Send a batch of user messages to the agent as one request and reply once."""
+
+    agent_client: DigitalOceanAgentClient = context.application.bot_data["agent_client"]
+    session_id = await _ensure_session(context)
+    user_message = "\n".join(update.message.text.strip() for update in batch)
+    # Reply to the most recent message of the batch
+    message = batch[-1].message
+
     # maintain per-user history in context.user_data
     history: list[dict] = context.user_data.get(_HISTORY_KEY, [])
     # append user message
@@ -144,7 +217,7 @@ async def forward_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             response = await agent_client.send_message(session_id, message=user_message)
     except DigitalOceanAgentError as exc:
         logger.exception("DigitalOcean Agent error: %s", exc)
-        await update.message.reply_text(
+        await message.reply_text(
             "Не удалось получить ответ от нейросети. Попробуй чуть позже."
         )
         return
@@ -162,11 +235,12 @@ async def forward_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         history.append({"role": "assistant", "content": assistant_text})
         context.user_data[_HISTORY_KEY] = history[-MAX_HISTORY:]
 
-    await update.message.reply_text(assistant_text)
+    await message.reply_text(assistant_text)
 
 
 async def reset_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Reset conversation context for the current user."""
+    _start_new_generation(context)
     context.user_data.pop(_SESSION_ID_KEY, None)
     context.user_data.pop(_HISTORY_KEY, None)
     await update.message.reply_text("Контекст беседы удалён. Начните новую сессию.")
@@ -180,11 +254,57 @@ async def _ensure_session(context: ContextTypes.DEFAULT_TYPE) -> str:
     session_id = context.user_data.get(_SESSION_ID_KEY)
     if session_id:
         return session_id
+    pending: Optional[asyncio.Task] = context.user_data.pop(_SESSION_TASK_KEY, None)
+    if pending is not None:
+        try:
+            session_id = await pending
+        except (DigitalOceanAgentError, httpx.HTTPError):
+            logger.warning("Pre-warmed session was not created; retrying", exc_info=True)
+        else:
+            if session_id:
+                return session_id
     return await _create_and_store_session(context)
 
 
+def _prewarm_session(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Start creating a session in the background if the user has none yet."""
+
+    if context.user_data.get(_SESSION_ID_KEY) or context.user_data.get(_SESSION_TASK_KEY):
+        return
+    context.user_data[_SESSION_TASK_KEY] = context.application.create_task(
+        _prewarm_session_task(context)
+    )
+
+
+async def _prewarm_session_task(context: ContextTypes.DEFAULT_TYPE) -> Optional[str]:
+    # A failed pre-warm is expected to happen now and then; log it here rather
+    # than through the generic error handler, and let _ensure_session retry.
+    try:
+        return await _create_and_store_session(context)
+    except (DigitalOceanAgentError, httpx.HTTPError):
+        logger.warning("Could not pre-warm agent session", exc_info=True)
+        return None
+
+
+def _start_new_generation(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Invalidate sessions still being created, as /new and /reset must win.
+
+    A session request started before the bump (a pre-warm, or one awaited by the
+    message worker) may finish later; it is then used for its own request but
+    never stored over the newer session.
+    """
+
+    generation = context.user_data.get(_SESSION_GENERATION_KEY, 0)
+    context.user_data[_SESSION_GENERATION_KEY] = generation + 1
+    pending: Optional[asyncio.Task] = context.user_data.pop(_SESSION_TASK_KEY, None)
+    if pending is not None:
+        pending.cancel()
+
+
 async def _create_and_store_session(context: ContextTypes.DEFAULT_TYPE) -> str:
     agent_client: DigitalOceanAgentClient = context.application.bot_data["agent_client"]
+    generation = context.user_data.get(_SESSION_GENERATION_KEY, 0)
     session_id = await agent_client.create_session()
-    context.user_data[_SESSION_ID_KEY] = session_id
+    if context.user_data.get(_SESSION_GENERATION_KEY, 0) == generation:
+        context.user_data[_SESSION_ID_KEY] = session_id
     return session_id